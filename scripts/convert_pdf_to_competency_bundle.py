@@ -13,20 +13,35 @@ served by the static application without requiring PDF parsing in the browser.
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
 import re
-from collections import defaultdict
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable, Iterator
 
 try:
     from pypdf import PdfReader
 except ModuleNotFoundError as exc:  # pragma: no cover - guard for clearer error message
     raise SystemExit("pypdf is required. Install with `pip install pypdf`.") from exc
 
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional faster serialiser
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[1]
 PDF_PATH = ROOT / "(5) PGR Competancy Checklist.pdf"
 OUTPUT_PATH = ROOT / "data" / "pgr_competency_checklist_bundle.json"
 LEGACY_BUNDLE_PATH = ROOT / "data" / "(5) PGR Competency Checklist.txt"
+# Measured with the checklist's pages: pypdf extracts ~55-90 ms per page, while a
+# two-worker pool adds ~50 ms of start-up plus ~10 ms of IPC per page. With two or more
+# cores the pool pays off after a handful of pages; 16 leaves room for cheaper pages.
+PARALLEL_PAGE_THRESHOLD = 16
 
 SECTION_PATTERNS = [
     ("STARTING SHIFT", "Starting Shift"),
@@ -39,8 +54,21 @@ SECTION_PATTERNS = [
     ("BOH CLEANING/DUTIES", "BOH Cleaning & Duties"),
 ]
 
-SKIP_TOKENS = {"TRAINER", "SUPERVISOR", "FROM", "OASIS", "SOVEREIGN", "S", "DISP", "NORTH", "SOUTH"}
-CONTINUATION_SUFFIXES = {
+# Longest prefixes first so overlapping headings resolve to the most specific title.
+_SECTION_RE = re.compile(
+    "^("
+    + "|".join(
+        re.escape(prefix)
+        for prefix, _ in sorted(SECTION_PATTERNS, key=lambda pattern: -len(pattern[0]))
+    )
+    + ")"
+)
+_SECTION_TITLES = dict(SECTION_PATTERNS)
+
+SKIP_TOKENS = frozenset(
+    {"TRAINER", "SUPERVISOR", "FROM", "OASIS", "SOVEREIGN", "S", "DISP", "NORTH", "SOUTH"}
+)
+CONTINUATION_SUFFIXES = frozenset({
     "and",
     "of",
     "the",
@@ -52,46 +80,105 @@ CONTINUATION_SUFFIXES = {
     "between",
     "from",
     "all",
-}
+})
+
+# Page furniture (footers, cover headings, form fields and the revision stamp) to drop.
+_SKIP_RE = re.compile(
+    r"^(?:\d+\s*\|\s*P A G E$|WELCOME TO PGR|PGR COMPETENCY CHECKLIST|NAME:|DATE:|09/11/24 PP$)",
+    re.IGNORECASE,
+)
+_TRAILING_NA_RE = re.compile(r"\s+NA$", re.IGNORECASE)
+_EN_DASH_RE = re.compile(r"\s*–\s*")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SOURCE_DIGEST_RE = re.compile(rb'"_sourceDigest":\s*"([0-9a-f]+)"')
+
+
+class _SlugTable(dict):
+    """``str.translate`` table mapping anything outside ``[a-z0-9]`` to a hyphen."""
+
+    def __missing__(self, key: int) -> str:
+        return "-"
+
+
+_SLUG_CHARS = frozenset(string.ascii_lowercase + string.digits)
+_SLUG_TABLE = _SlugTable(
+    {code: chr(code) if chr(code) in _SLUG_CHARS else "-" for code in range(128)}
+)
+
+
+def page_text(page) -> str:
+    """Extract upright text in pypdf's plain mode; the checklist has no rotated text."""
+
+    try:
+        return page.extract_text(extraction_mode="plain", orientations=0) or ""
+    except TypeError:  # pragma: no cover - pypdf < 3.17 has no extraction_mode
+        return page.extract_text(orientations=0) or ""
+
+
+_worker_reader = None
+
+
+def _open_worker_reader(path: str) -> None:
+    """Pool initializer: parse the PDF once per worker rather than once per page."""
 
+    global _worker_reader
+    _worker_reader = PdfReader(path)
+
+
+def _page_text(index: int) -> str:
+    return page_text(_worker_reader.pages[index])
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def iter_page_texts(pdf_path: Path) -> Iterator[str]:
+    """Yield the text of each page in order, extracting large PDFs in parallel."""
 
-def extract_lines(pdf_path: Path) -> list[str]:
     reader = PdfReader(str(pdf_path))
-    text = "\n".join(page.extract_text() or "" for page in reader.pages)
-    raw_lines = [re.sub(r"\s+", " ", line.strip()) for line in text.splitlines()]
-    cleaned: list[str] = []
-    for line in raw_lines:
-        if not line:
-            cleaned.append("")
-            continue
-        upper = line.upper()
-        if re.match(r"^\d+\s*\|\s*P A G E$", upper):
-            continue
-        if upper.startswith("WELCOME TO PGR"):
-            continue
-        if upper.startswith("PGR COMPETENCY CHECKLIST"):
-            continue
-        if upper.startswith("NAME:") or upper.startswith("DATE:"):
-            continue
-        if line == "09/11/24 PP":
-            continue
-        cleaned.append(line)
-    return cleaned
+    page_count = len(reader.pages)
+    workers = min(available_cpus(), page_count)
+    if workers < 2 or page_count < PARALLEL_PAGE_THRESHOLD:
+        for page in reader.pages:
+            yield page_text(page)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_open_worker_reader, initargs=(str(pdf_path),)
+    ) as executor:
+        yield from executor.map(
+            _page_text, range(page_count), chunksize=max(1, page_count // (workers * 4))
+        )
 
 
-def is_section_header(line: str) -> tuple[bool, str | None]:
-    upper = line.upper()
-    for prefix, title in SECTION_PATTERNS:
-        if upper.startswith(prefix):
-            return True, title
+def extract_lines(pdf_path: Path) -> Iterator[str]:
+    for text in iter_page_texts(pdf_path):
+        for raw in text.splitlines():
+            line = " ".join(raw.split())
+            if not line:
+                yield ""
+                continue
+            if _SKIP_RE.match(line):
+                continue
+            yield line
+
+
+def is_section_header(upper: str) -> tuple[bool, str | None]:
+    match = _SECTION_RE.match(upper)
+    if match:
+        return True, _SECTION_TITLES[match.group(1)]
     return False, None
 
 
+@lru_cache(maxsize=2048)
 def normalise_item_text(text: str) -> str:
     text = text.strip()
-    text = re.sub(r"\s+NA$", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\s*–\s*", " - ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _TRAILING_NA_RE.sub("", text)
+    text = _EN_DASH_RE.sub(" - ", text)
+    # Lines arrive single-spaced, but adjacent dashes ("a – – b") leave double spaces.
+    text = _WHITESPACE_RE.sub(" ", text)
     return text.strip()
 
 
@@ -100,40 +187,44 @@ def should_continue(previous: str, current: str) -> bool:
         return False
     if not current:
         return True
-    if current.startswith("(") or current[0].islower():
+    first = current[0]
+    if first == "(" or first.islower():
         return True
-    words = previous.split()
-    if words and words[-1].lower() in CONTINUATION_SUFFIXES:
+    # Both fragments are single-spaced, so word checks reduce to substring tests.
+    if previous.rpartition(" ")[2].lower() in CONTINUATION_SUFFIXES:
         return True
-    if "between" in (w.lower() for w in words) and len(current.split()) <= 2:
+    if " between " in f" {previous.lower()} " and current.count(" ") <= 1:
         return True
-    if len(current.split()) == 1 and current.upper() == current:
+    if " " not in current and current.isupper():
         return True
     return False
 
 
-def parse_sections(lines: list[str]) -> list[dict[str, list[str]]]:
-    sections: list[dict[str, list[str]]] = []
-    current_section: dict[str, list[str]] | None = None
-    buffer: list[str] = []
+def flush_item(buffer: list[str], section: dict[str, list[str]] | None) -> None:
+    """Emit the buffered fragments as one checklist item and reset the buffer."""
 
-    def flush_buffer():
-        nonlocal buffer
-        if current_section is None or not buffer:
-            buffer = []
-            return
+    if section is not None:
         text = normalise_item_text(" ".join(buffer))
         if text:
-            current_section["items"].append(text)
-        buffer = []
+            section["items"].append(text)
+    buffer.clear()
+
+
+def parse_sections(lines: Iterable[str]) -> list[dict[str, list[str]]]:
+    sections: list[dict[str, list[str]]] = []
+    current_section: dict[str, list[str]] | None = None
+    buffer: list[str] = []
 
     for line in lines:
         if not line:
-            flush_buffer()
+            if buffer:
+                flush_item(buffer, current_section)
             continue
-        is_header, title = is_section_header(line)
+        upper = line.upper()
+        is_header, title = is_section_header(upper)
         if is_header:
-            flush_buffer()
+            if buffer:
+                flush_item(buffer, current_section)
             if current_section and current_section.get("title") == title:
                 # Same heading repeated on a new page – keep appending.
                 pass
@@ -141,43 +232,52 @@ def parse_sections(lines: list[str]) -> list[dict[str, list[str]]]:
                 current_section = {"title": title or line, "items": []}
                 sections.append(current_section)
             continue
-        tokens = set(line.upper().split())
-        if tokens and tokens.issubset(SKIP_TOKENS):
+        tokens = upper.split()
+        if tokens and all(token in SKIP_TOKENS for token in tokens):
             continue
         cleaned = normalise_item_text(line)
         if not cleaned:
-            flush_buffer()
+            if buffer:
+                flush_item(buffer, current_section)
             continue
         if buffer:
             if should_continue(buffer[-1], cleaned):
                 buffer.append(cleaned)
                 continue
-            flush_buffer()
+            flush_item(buffer, current_section)
         buffer.append(cleaned)
-    flush_buffer()
+    if buffer:
+        flush_item(buffer, current_section)
     return sections
 
 
-def slugify(text: str, seen: dict[str, int]) -> str:
-    base = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
-    if not base:
-        base = "item"
-    count = seen[base]
-    seen[base] += 1
-    if count:
-        return f"{base}-{count}"
-    return base
+def slugify(text: str) -> str:
+    base = text.lower().translate(_SLUG_TABLE)
+    while "--" in base:
+        base = base.replace("--", "-")
+    return base.strip("-") or "item"
+
 
+def unique_slugs(labels: list[str]) -> list[str]:
+    """Slug every label, suffixing repeats with ``-1``, ``-2``… in order of appearance."""
 
-def build_bundle(sections: list[dict[str, list[str]]]) -> dict:
-    slug_counts: defaultdict[str, int] = defaultdict(int)
+    slug_counts: dict[str, int] = {}
+    slugs: list[str] = []
+    for base in [slugify(label) for label in labels]:
+        count = slug_counts.get(base, 0)
+        slug_counts[base] = count + 1
+        slugs.append(f"{base}-{count}" if count else base)
+    return slugs
+
+
+def build_bundle(sections: list[dict[str, list[str]]], source_digest: str) -> dict:
+    item_ids = iter(unique_slugs([text for section in sections for text in section["items"]]))
     template_sections = []
     for section in sections:
         items = []
         for item_text in section["items"]:
-            item_id = slugify(item_text, slug_counts)
             items.append({
-                "id": item_id,
+                "id": next(item_ids),
                 "label": item_text,
                 "defaultStatus": "Not Started",
             })
@@ -190,6 +290,7 @@ def build_bundle(sections: list[dict[str, list[str]]]) -> dict:
         "bundle": "PGR Competency Checklist (PDF)",
         "source": PDF_PATH.name,
         "generated": True,
+        "_sourceDigest": source_digest,
         "template": {
             "title": "PGR Competency Checklist",
             "version": "2024.11",
@@ -221,22 +322,90 @@ def build_bundle(sections: list[dict[str, list[str]]]) -> dict:
     return bundle
 
 
+def parse_json(data: bytes):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def serialise_bundle(bundle: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(bundle, option=orjson.OPT_INDENT_2)
+    return json.dumps(bundle, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_bundle(bundle: dict) -> None:
+    """Write the bundle beside its destination and swap it into place atomically."""
+
+    data = serialise_bundle(bundle)
+    tmp_path = OUTPUT_PATH.with_suffix(OUTPUT_PATH.suffix + ".tmp")
+    try:
+        with tmp_path.open("wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, OUTPUT_PATH)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def source_digest() -> str:
+    """Hash every input the bundle is derived from: the parser, PDF and legacy defaults.
+
+    Content hashes rather than mtimes keep the marker identical across checkouts.
+    """
+
+    digest = hashlib.sha256()
+    for path in (Path(__file__).resolve(), PDF_PATH, LEGACY_BUNDLE_PATH):
+        data = path.read_bytes() if path.exists() else b""
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def is_bundle_current(digest: str) -> bool:
+    """Return True when the existing output was generated from these exact inputs."""
+
+    if not OUTPUT_PATH.exists():
+        return False
+    # The marker sits beside the bundle header, so only the head of the file is read.
+    with OUTPUT_PATH.open("rb") as handle:
+        match = _SOURCE_DIGEST_RE.search(handle.read(512))
+    return match is not None and match.group(1).decode("ascii") == digest
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert the PGR competency checklist PDF into a JSON bundle."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the bundle even when it already matches its inputs.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     if not PDF_PATH.exists():
         raise SystemExit(f"PDF not found at {PDF_PATH}")
-    lines = extract_lines(PDF_PATH)
-    sections = parse_sections(lines)
-    bundle = build_bundle(sections)
+    digest = source_digest()
+    if not args.force and is_bundle_current(digest):
+        print(f"{OUTPUT_PATH.relative_to(ROOT)} is up to date")
+        return
+    sections = parse_sections(extract_lines(PDF_PATH))
+    bundle = build_bundle(sections, digest)
     if LEGACY_BUNDLE_PATH.exists():
         try:
-            legacy = json.loads(LEGACY_BUNDLE_PATH.read_text())
+            legacy = parse_json(LEGACY_BUNDLE_PATH.read_bytes())
         except json.JSONDecodeError:
             legacy = {}
         legacy_dataset = legacy.get("dataset", {}) if isinstance(legacy, dict) else {}
         legacy_defaults = legacy_dataset.get("defaults")
         if isinstance(legacy_defaults, dict):
             bundle["dataset"]["defaults"].update(legacy_defaults)
-    OUTPUT_PATH.write_text(json.dumps(bundle, indent=2, ensure_ascii=False))
+    write_bundle(bundle)
     print(f"Wrote {OUTPUT_PATH.relative_to(ROOT)} with {len(sections)} sections")
 
 
@@ -3,16 +3,32 @@ from __future__ import annotations
 
 import argparse
 import json
+from copy import copy
+from functools import lru_cache
 from itertools import cycle
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.formatting import ConditionalFormatting
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 
+try:
+    from openpyxl.styles.cell_style import StyleArray
+    from openpyxl.styles.styleable import StyleableObject
+except ImportError:  # pragma: no cover - openpyxl internals moved
+    StyleArray = StyleableObject = None
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional faster parser
+    orjson = None
+
 DEFAULT_INPUT_PATH = Path("data/pgr_competency_checklist_bundle.json")
 DEFAULT_OUTPUT_PATH = Path("data/PGR_Competency_Checklist.xlsx")
 
@@ -22,6 +38,9 @@ KNOWN_SECTION_COLOURS: Dict[str, Tuple[str, str]] = {
     "Compliance & Guest Care": ("FFF4E6", "E65100"),
 }
 
+# Fill and text colour for sections missing from the resolved section styles.
+DEFAULT_SECTION_STYLE: Tuple[str, str] = ("F8FAFC", "1F2933")
+
 SECTION_COLOUR_FALLBACKS: Tuple[Tuple[str, str], ...] = (
     ("E8ECFF", "1F3B70"),
     ("E8F5E9", "1B5E20"),
@@ -38,20 +57,167 @@ STATUS_COLOUR_PRESETS = {
 
 STATUS_COLOUR_FALLBACKS = ("E2E8F0", "FFEFD5", "E3F2FD", "F8D7DA")
 
+# Compact per-item status codes used for Progress Summary counting.
+STATUS_CODES = {"Not Started": 0, "In Progress": 1, "Complete": 2}
+OTHER_STATUS_CODE = 3
+COMPLETE_CODE = STATUS_CODES["Complete"]
+
+# Shared read-only stand-in for items a person has no progress recorded against.
+EMPTY_COMPETENCY = MappingProxyType({})
+
+OVERVIEW_INSTRUCTIONS: Tuple[str, ...] = (
+    "Review the Competency Matrix tab to track each team member's progress.",
+    "Update the Status column using the drop-down menu for each competency.",
+    "Record completion dates and any coaching notes for full transparency.",
+    "Use the TM/Manager sign-off columns to capture verification at key milestones.",
+    "Refer to the Progress Summary tab for at-a-glance completion metrics by area.",
+)
+
+MATRIX_HEADERS: Tuple[str, ...] = (
+    "Team Member",
+    "Staff ID",
+    "Role",
+    "Assigned Mentor",
+    "Start Date",
+    "Area",
+    "Competency",
+    "Details",
+    "Status",
+    "Completed On",
+    "Notes",
+    "TM Sign-Off",
+    "Manager Sign-Off",
+)
+
+OVERVIEW_COLUMN_WIDTHS: Tuple[Tuple[str, int], ...] = (("A", 35), ("B", 60), ("C", 18))
+
+MATRIX_COLUMN_WIDTHS: Tuple[Tuple[str, int], ...] = (
+    ("A", 22),
+    ("B", 12),
+    ("C", 20),
+    ("D", 20),
+    ("E", 14),
+    ("F", 24),
+    ("G", 34),
+    ("H", 48),
+    ("I", 16),
+    ("J", 16),
+    ("K", 30),
+    ("L", 16),
+    ("M", 18),
+)
+
+# Layout colours and fixed cells shared by the openpyxl and xlsxwriter builders.
+TEXT_COLOUR = "1F2933"
+SUBTITLE_COLOUR = "52606D"
+HEADER_TEXT_COLOUR = "FFFFFF"
+MATRIX_HEADER_FILL = "1F2933"
+PROGRESS_HEADER_FILL = "334155"
+LEGEND_HEADER_FILL = "E5E9F0"
+BORDER_COLOUR = "D0D7DE"
+
+OVERVIEW_MERGED_RANGES: Tuple[str, ...] = ("A1:F1", "A2:F2")
+# The legend header spans the six merged title columns.
+LEGEND_HEADERS: Tuple[str | None, ...] = ("Area", "Description", "Colour", None, None, None)
+
+PROGRESS_COLUMN_WIDTHS: Tuple[Tuple[str, int], ...] = (
+    ("A", 24),
+    ("B", 24),
+    ("C", 24),
+    ("D", 26),
+    ("E", 16),
+)
+
+# Conditional formats for the Progress Summary "Overall %" column, as
+# (openpyxl operator, xlsxwriter criteria, formula, fill colour).
+PROGRESS_RULES: Tuple[Tuple[str, str, Tuple[str, ...], str], ...] = (
+    ("greaterThanOrEqual", "greater than or equal to", ("90",), "D4EDDA"),
+    ("between", "between", ("60", "89"), "FFF3CD"),
+    ("lessThan", "less than", ("60",), "F8D7DA"),
+)
+
+ENGINES = ("openpyxl", "xlsxwriter")
+
 BORDER_THIN = Border(
-    left=Side(border_style="thin", color="D0D7DE"),
-    right=Side(border_style="thin", color="D0D7DE"),
-    top=Side(border_style="thin", color="D0D7DE"),
-    bottom=Side(border_style="thin", color="D0D7DE"),
+    left=Side(border_style="thin", color=BORDER_COLOUR),
+    right=Side(border_style="thin", color=BORDER_COLOUR),
+    top=Side(border_style="thin", color=BORDER_COLOUR),
+    bottom=Side(border_style="thin", color=BORDER_COLOUR),
+)
+
+ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
+ALIGN_CENTER_H = Alignment(horizontal="center")
+ALIGN_LEFT = Alignment(horizontal="left")
+ALIGN_LEFT_VCENTER = Alignment(horizontal="left", vertical="center")
+ALIGN_VCENTER = Alignment(vertical="center")
+ALIGN_WRAP = Alignment(wrap_text=True)
+ALIGN_WRAP_TOP = Alignment(wrap_text=True, vertical="top")
+
+# Matrix cells copy a pre-resolved StyleArray through the private ``_style`` slot
+# (checked against openpyxl 3.0 and 3.1). If a release drops it, assign the shared
+# style objects through the public attributes instead.
+COPY_STYLE_ARRAYS = StyleArray is not None and "_style" in getattr(
+    StyleableObject, "__slots__", ()
+)
+
+# Per-column alignment for Competency Matrix body rows (columns A..M). The
+# section column additionally takes the section's fill and font.
+MATRIX_SECTION_COLUMN = 6
+MATRIX_STATUS_COLUMN = 9
+MATRIX_COLUMN_ALIGNMENTS: Tuple[Alignment, ...] = (
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_CENTER,
+    ALIGN_VCENTER,
+    ALIGN_WRAP_TOP,
+    ALIGN_CENTER_H,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
+    ALIGN_VCENTER,
 )
 
 
+class FlatItem(NamedTuple):
+    """A template item with its section context and styles resolved up front."""
+
+    section_title: str
+    section_fill: PatternFill
+    section_font: Font
+    item_id: str
+    label: str
+    description: str
+    default_status: str
+
+
+class SectionSpan(NamedTuple):
+    """The slice of the flattened item list belonging to one template section."""
+
+    title: str
+    start: int
+    stop: int
+
+
+@lru_cache(maxsize=None)
 def make_fill(colour: str) -> PatternFill:
-    """Return a solid PatternFill for a given hex colour string."""
+    """Return a shared solid PatternFill for a given hex colour string."""
 
     return PatternFill(start_color=colour, end_color=colour, fill_type="solid")
 
 
+@lru_cache(maxsize=None)
+def make_font(colour: str | None = None, size: float | None = None, bold: bool = False) -> Font:
+    """Return a shared Font; style objects are only ever assigned, never mutated."""
+
+    return Font(size=size, bold=bold, color=colour)
+
+
+HEADER_FONT = make_font(HEADER_TEXT_COLOUR, bold=True)
+
+
 def compute_section_styles(template: dict) -> Dict[str, Tuple[str, str]]:
     """Assign fills and text colours for each template section."""
 
@@ -66,29 +232,134 @@ def compute_section_styles(template: dict) -> Dict[str, Tuple[str, str]]:
     return resolved
 
 
-def compute_status_fills(status_options: Iterable[str]) -> Dict[str, PatternFill]:
-    """Return PatternFill instances keyed by each possible status option."""
+def compute_status_colours(status_options: Sequence[str]) -> Dict[str, str]:
+    """Return the hex fill colour for each possible status option."""
 
-    fills: Dict[str, PatternFill] = {}
+    colours: Dict[str, str] = {}
     fallback_cycle = cycle(STATUS_COLOUR_FALLBACKS)
     for option in status_options:
-        colour = STATUS_COLOUR_PRESETS.get(option, next(fallback_cycle))
-        fills[option] = make_fill(colour)
-    return fills
+        colours[option] = STATUS_COLOUR_PRESETS.get(option, next(fallback_cycle))
+    return colours
+
+
+def list_validation_formula(options: Iterable[str]) -> str:
+    """Return the quoted, comma-separated formula1 for a list data validation."""
+
+    return "\"" + ",".join(options) + "\""
+
+
+def compute_status_fills(status_options: Sequence[str]) -> Dict[str, PatternFill]:
+    """Return PatternFill instances keyed by each possible status option."""
+
+    return {
+        option: make_fill(colour)
+        for option, colour in compute_status_colours(status_options).items()
+    }
+
+
+def styled_cell(
+    ws,
+    value=None,
+    *,
+    font: Font | None = None,
+    fill: PatternFill | None = None,
+    alignment: Alignment | None = None,
+    border: Border | None = None,
+) -> WriteOnlyCell:
+    """Return a write-only cell with the given styles applied before it is appended."""
+
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    if border is not None:
+        cell.border = border
+    return cell
+
+
+def create_table_sheet(
+    wb: Workbook,
+    title: str,
+    column_widths: Iterable[Tuple[str, int]],
+    headers: Iterable[str],
+    header_fill_colour: str,
+):
+    """Create a gridless sheet with a frozen, styled header row ready for data rows."""
+
+    ws = wb.create_sheet(title=title)
+    ws.sheet_view.showGridLines = False
+    for col, width in column_widths:
+        ws.column_dimensions[col].width = width
+    ws.freeze_panes = "A2"
+
+    header_fill = make_fill(header_fill_colour)
+    ws.append(
+        [
+            styled_cell(
+                ws,
+                header,
+                font=HEADER_FONT,
+                fill=header_fill,
+                alignment=ALIGN_CENTER,
+                border=BORDER_THIN,
+            )
+            for header in headers
+        ]
+    )
+    return ws
+
+
+def flatten_template(
+    template: dict, section_styles: Dict[str, Tuple[str, str]], default_status: str
+) -> Tuple[List[FlatItem], List[SectionSpan]]:
+    """Resolve every template item once so sheet builders avoid nested dict lookups."""
+
+    flat_items: List[FlatItem] = []
+    spans: List[SectionSpan] = []
+    for section in template["sections"]:
+        section_title = section["title"]
+        fill_colour, text_colour = section_styles.get(section_title, DEFAULT_SECTION_STYLE)
+        section_fill = make_fill(fill_colour)
+        section_font = make_font(text_colour, bold=True)
+        start = len(flat_items)
+        for item in section["items"]:
+            flat_items.append(
+                FlatItem(
+                    section_title,
+                    section_fill,
+                    section_font,
+                    item["id"],
+                    item["label"],
+                    item.get("description", ""),
+                    item.get("defaultStatus", default_status),
+                )
+            )
+        spans.append(SectionSpan(section_title, start, len(flat_items)))
+    return flat_items, spans
 
 
 def build_workbook(dataset: dict, template: dict) -> Workbook:
-    wb = Workbook()
-    overview = wb.active
-    overview.title = "Overview"
+    # Write-only workbooks stream each appended row to disk, so memory stays flat
+    # however many people and competencies the matrix holds. Sheet settings such as
+    # column widths and freeze panes must therefore be applied before the first row.
+    wb = Workbook(write_only=True)
+    overview = wb.create_sheet(title="Overview")
 
     section_styles = compute_section_styles(template)
     status_options = template.get("statusOptions") or list(STATUS_COLOUR_PRESETS.keys())
     status_fills = compute_status_fills(status_options)
+    default_status = dataset.get("defaults", {}).get(
+        "defaultStatus", status_options[0] if status_options else ""
+    )
+    flat_items, section_spans = flatten_template(template, section_styles, default_status)
+    status_formula = list_validation_formula(status_options)
 
     build_overview_sheet(overview, dataset, template, section_styles)
-    build_matrix_sheet(wb, dataset, template, section_styles, status_options, status_fills)
-    build_progress_sheet(wb, dataset, template)
+    build_matrix_sheet(wb, dataset, flat_items, status_formula, status_fills)
+    build_progress_sheet(wb, dataset, flat_items, section_spans)
 
     return wb
 
@@ -97,289 +368,474 @@ def build_overview_sheet(
     ws, dataset: dict, template: dict, section_styles: Dict[str, Tuple[str, str]]
 ) -> None:
     ws.sheet_view.showGridLines = False
-    ws.merge_cells("A1:F1")
-    ws["A1"] = template["title"]
-    ws["A1"].font = Font(size=20, bold=True, color="1F2933")
-    ws["A1"].alignment = Alignment(horizontal="center")
-
-    ws.merge_cells("A2:F2")
-    ws["A2"] = f"Version {template['version']} | Dataset updated {dataset['updated']}"
-    ws["A2"].font = Font(size=11, color="52606D")
-    ws["A2"].alignment = Alignment(horizontal="center")
-
-    ws["A4"] = "How to use this workbook"
-    ws["A4"].font = Font(size=14, bold=True, color="1F2933")
-
-    instructions = [
-        "Review the Competency Matrix tab to track each team member's progress.",
-        "Update the Status column using the drop-down menu for each competency.",
-        "Record completion dates and any coaching notes for full transparency.",
-        "Use the TM/Manager sign-off columns to capture verification at key milestones.",
-        "Refer to the Progress Summary tab for at-a-glance completion metrics by area.",
-    ]
-
-    for idx, item in enumerate(instructions, start=5):
-        ws[f"A{idx}"] = f"• {item}"
-        ws[f"A{idx}"].alignment = Alignment(horizontal="left")
-        ws[f"A{idx}"].font = Font(size=11)
-
-    ws["A11"] = "Colour legend"
-    ws["A11"].font = Font(size=14, bold=True, color="1F2933")
+    for col, width in OVERVIEW_COLUMN_WIDTHS:
+        ws.column_dimensions[col].width = width
+    for cell_range in OVERVIEW_MERGED_RANGES:
+        ws.merged_cells.add(cell_range)
+
+    heading_font = make_font(TEXT_COLOUR, size=14, bold=True)
+    label_font = make_font(TEXT_COLOUR, bold=True)
+
+    ws.append(
+        [
+            styled_cell(
+                ws,
+                template["title"],
+                font=make_font(TEXT_COLOUR, size=20, bold=True),
+                alignment=ALIGN_CENTER_H,
+            )
+        ]
+    )
+    ws.append(
+        [
+            styled_cell(
+                ws,
+                f"Version {template['version']} | Dataset updated {dataset['updated']}",
+                font=make_font(SUBTITLE_COLOUR, size=11),
+                alignment=ALIGN_CENTER_H,
+            )
+        ]
+    )
+    ws.append([])
+    ws.append([styled_cell(ws, "How to use this workbook", font=heading_font)])
+
+    instruction_font = make_font(size=11)
+    for item in OVERVIEW_INSTRUCTIONS:
+        ws.append(
+            [
+                styled_cell(
+                    ws,
+                    f"• {item}",
+                    font=instruction_font,
+                    alignment=ALIGN_LEFT,
+                )
+            ]
+        )
 
-    ws["A12"] = "Area"
-    ws["B12"] = "Description"
-    ws["C12"] = "Colour"
-    for cell in ws["12:12"]:
-        cell.font = Font(bold=True, color="1F2933")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.fill = PatternFill(start_color="E5E9F0", end_color="E5E9F0", fill_type="solid")
-        cell.border = BORDER_THIN
+    ws.append([])
+    ws.append([styled_cell(ws, "Colour legend", font=heading_font)])
+
+    legend_fill = make_fill(LEGEND_HEADER_FILL)
+    ws.append(
+        [
+            styled_cell(
+                ws,
+                value,
+                font=label_font,
+                fill=legend_fill,
+                alignment=ALIGN_CENTER,
+                border=BORDER_THIN,
+            )
+            for value in LEGEND_HEADERS
+        ]
+    )
 
-    row = 13
     for section in template["sections"]:
         title = section["title"]
-        fill_colour, _ = section_styles.get(title, ("F8FAFC", "1F2933"))
+        fill_colour, _ = section_styles.get(title, DEFAULT_SECTION_STYLE)
         colour_fill = make_fill(fill_colour)
 
-        ws[f"A{row}"] = title
-        ws[f"A{row}"].font = Font(bold=True, color="1F2933")
-        ws[f"B{row}"] = section.get("description", "")
-        ws[f"B{row}"].alignment = Alignment(wrap_text=True)
-        ws[f"C{row}"].fill = colour_fill
-        for col in "ABC":
-            ws[f"{col}{row}"].border = BORDER_THIN
-        row += 1
+        ws.append(
+            [
+                styled_cell(ws, title, font=label_font, border=BORDER_THIN),
+                styled_cell(
+                    ws,
+                    section.get("description", ""),
+                    alignment=ALIGN_WRAP,
+                    border=BORDER_THIN,
+                ),
+                styled_cell(ws, fill=colour_fill, border=BORDER_THIN),
+            ]
+        )
+
+
+def iter_matrix_rows(
+    dataset: dict, flat_items: List[FlatItem]
+) -> Iterator[Tuple[FlatItem, tuple]]:
+    """Yield each (person, item) pair's template item and its matrix row values."""
+
+    template_defaults = dataset.get("defaults", {})
+    for person in dataset.get("people", []):
+        meta_notes = person.get("notes", "")
+        competencies = person.get("competencies") or EMPTY_COMPETENCY
+        name = person.get("name", "")
+        staff_id = person.get("staffId", "")
+        role = person.get("role", template_defaults.get("role", ""))
+        mentor = person.get("mentor", template_defaults.get("mentor", ""))
+        start_date = person.get("startDateDisplay", template_defaults.get("startDateDisplay", ""))
+        for item in flat_items:
+            competency_data = competencies.get(item.item_id) or EMPTY_COMPETENCY
+            yield item, (
+                name,
+                staff_id,
+                role,
+                mentor,
+                start_date,
+                item.section_title,
+                item.label,
+                item.description,
+                competency_data.get("status", item.default_status),
+                competency_data.get("completedOn", ""),
+                build_notes(meta_notes, competency_data.get("notes", "")),
+                "",
+                "",
+            )
+
+
+def encode_statuses(competencies, flat_items: List[FlatItem]) -> bytes:
+    """Return one status code byte per flattened item for a person's recorded progress."""
 
-    ws.column_dimensions["A"].width = 35
-    ws.column_dimensions["B"].width = 60
-    ws.column_dimensions["C"].width = 18
+    codes = bytearray(len(flat_items))
+    for index, item in enumerate(flat_items):
+        competency = competencies.get(item.item_id)
+        if competency:
+            codes[index] = STATUS_CODES.get(competency.get("status"), OTHER_STATUS_CODE)
+    return bytes(codes)
+
+
+def progress_headers(section_spans: List[SectionSpan]) -> List[str]:
+    return ["Team Member", *[span.title for span in section_spans], "Overall %", "Last Updated"]
+
+
+def iter_progress_rows(
+    dataset: dict, flat_items: List[FlatItem], section_spans: List[SectionSpan]
+) -> Iterator[list]:
+    """Yield one Progress Summary row of per-section completion counts per person."""
+
+    updated = dataset.get("updated", "")
+    # Section sizes depend only on the template, so work them out once.
+    spans = [(start, stop, f" / {stop - start}") for _, start, stop in section_spans]
+    total_items = sum(stop - start for _, start, stop in section_spans)
+    for person in dataset.get("people", []):
+        codes = encode_statuses(person.get("competencies") or EMPTY_COMPETENCY, flat_items)
+        row = [person.get("name", "")]
+        total_completed = 0
+        for start, stop, size_suffix in spans:
+            # bytes.count scans the section's slice of codes in C.
+            completed = codes.count(COMPLETE_CODE, start, stop)
+            total_completed += completed
+            row.append(f"{completed}{size_suffix}")
+
+        overall_percent = round((total_completed / total_items) * 100) if total_items else 0
+        row.append(f"{overall_percent}%")
+        row.append(updated)
+        yield row
 
 
 def build_matrix_sheet(
     wb: Workbook,
     dataset: dict,
-    template: dict,
-    section_styles: Dict[str, Tuple[str, str]],
-    status_options: Iterable[str],
+    flat_items: List[FlatItem],
+    status_formula: str,
     status_fills: Dict[str, PatternFill],
 ) -> None:
-    status_options = list(status_options)
-    ws = wb.create_sheet(title="Competency Matrix")
-    ws.sheet_view.showGridLines = False
-    headers = [
-        "Team Member",
-        "Staff ID",
-        "Role",
-        "Assigned Mentor",
-        "Start Date",
-        "Area",
-        "Competency",
-        "Details",
-        "Status",
-        "Completed On",
-        "Notes",
-        "TM Sign-Off",
-        "Manager Sign-Off",
-    ]
+    ws = create_table_sheet(
+        wb, "Competency Matrix", MATRIX_COLUMN_WIDTHS, MATRIX_HEADERS, MATRIX_HEADER_FILL
+    )
 
-    ws.append(headers)
-    for cell in ws["1:1"]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="1F2933", end_color="1F2933", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = BORDER_THIN
-
-    template_defaults = dataset.get("defaults", {})
-    default_status = template_defaults.get("defaultStatus", status_options[0] if status_options else "")
+    def resolve_row_styles(item: FlatItem) -> list:
+        """Return each column's (font, fill, alignment), as StyleArrays when copyable."""
+
+        styles = [
+            (item.section_font, item.section_fill, alignment)
+            if col_idx == MATRIX_SECTION_COLUMN
+            else (None, None, alignment)
+            for col_idx, alignment in enumerate(MATRIX_COLUMN_ALIGNMENTS, start=1)
+        ]
+        if not COPY_STYLE_ARRAYS:
+            return styles
+        return [
+            styled_cell(ws, font=font, fill=fill, alignment=alignment, border=BORDER_THIN)._style
+            for font, fill, alignment in styles
+        ]
+
+    # Assigning Font/Fill/Alignment objects makes openpyxl hash and register each
+    # one against the workbook's style tables for every cell. Rows only differ by
+    # section, so resolve each section's style indices once and copy the resulting
+    # StyleArray onto every cell instead.
+    section_row_styles: Dict[str, list] = {}
 
     row_idx = 2
-    for person in dataset.get("people", []):
-        meta_notes = person.get("notes", "")
-        for section in template["sections"]:
-            section_title = section["title"]
-            fill_colour, text_colour = section_styles.get(
-                section_title, ("F8FAFC", "1F2933")
-            )
-            section_fill = make_fill(fill_colour)
-            for item in section["items"]:
-                competency_data = person.get("competencies", {}).get(item["id"], {})
-                status = competency_data.get(
-                    "status", item.get("defaultStatus", default_status)
-                )
-                completed_on = competency_data.get("completedOn", "")
-                item_notes = competency_data.get("notes", "")
-
-                ws.append(
-                    [
-                        person.get("name", ""),
-                        person.get("staffId", ""),
-                        person.get("role", template_defaults.get("role", "")),
-                        person.get("mentor", template_defaults.get("mentor", "")),
-                        person.get("startDateDisplay", template_defaults.get("startDateDisplay", "")),
-                        section_title,
-                        item["label"],
-                        item.get("description", ""),
-                        status,
-                        completed_on,
-                        build_notes(meta_notes, item_notes),
-                        "",
-                        "",
-                    ]
+    for item, values in iter_matrix_rows(dataset, flat_items):
+        row_styles = section_row_styles.get(item.section_title)
+        if row_styles is None:
+            row_styles = section_row_styles[item.section_title] = resolve_row_styles(item)
+        if COPY_STYLE_ARRAYS:
+            row_cells = []
+            for value, style in zip(values, row_styles):
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = copy(style)
+                row_cells.append(cell)
+        else:
+            row_cells = [
+                styled_cell(
+                    ws, value, font=font, fill=fill, alignment=alignment, border=BORDER_THIN
                 )
-
-                for col_idx in range(1, len(headers) + 1):
-                    cell = ws.cell(row=row_idx, column=col_idx)
-                    cell.border = BORDER_THIN
-                    if col_idx == 6:
-                        cell.fill = section_fill
-                        cell.font = Font(bold=True, color=text_colour)
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                    elif col_idx == 8:
-                        cell.alignment = Alignment(wrap_text=True, vertical="top")
-                    elif col_idx == 9:
-                        cell.alignment = Alignment(horizontal="center")
-                    else:
-                        cell.alignment = Alignment(vertical="center")
-                row_idx += 1
-
-    column_widths = {
-        "A": 22,
-        "B": 12,
-        "C": 20,
-        "D": 20,
-        "E": 14,
-        "F": 24,
-        "G": 34,
-        "H": 48,
-        "I": 16,
-        "J": 16,
-        "K": 30,
-        "L": 16,
-        "M": 18,
-    }
-    for col, width in column_widths.items():
-        ws.column_dimensions[col].width = width
-
-    ws.freeze_panes = "A2"
+                for value, (font, fill, alignment) in zip(values, row_styles)
+            ]
+        ws.append(row_cells)
+        row_idx += 1
 
     if row_idx == 2:
         return
 
-    status_range = f"I2:I{row_idx - 1}"
+    status_col_letter = get_column_letter(MATRIX_STATUS_COLUMN)
+    status_range = f"{status_col_letter}2:{status_col_letter}{row_idx - 1}"
     status_validation = DataValidation(
         type="list",
-        formula1="\"" + ",".join(status_options) + "\"",
+        formula1=status_formula,
         allow_blank=True,
     )
-    ws.add_data_validation(status_validation)
+    ws.data_validations.append(status_validation)
     status_validation.add(status_range)
 
+    # openpyxl groups rules sharing a range under one <conditionalFormatting>
+    # element; parse the range once and register every status rule against it.
+    status_formatting = ConditionalFormatting(status_range)
     for status, fill in status_fills.items():
         ws.conditional_formatting.add(
-            status_range,
+            status_formatting,
             CellIsRule(operator="equal", formula=["\"" + status + "\""], fill=fill),
         )
 
 
-def build_progress_sheet(wb: Workbook, dataset: dict, template: dict) -> None:
-    ws = wb.create_sheet(title="Progress Summary")
-    ws.sheet_view.showGridLines = False
+def build_progress_sheet(
+    wb: Workbook,
+    dataset: dict,
+    flat_items: List[FlatItem],
+    section_spans: List[SectionSpan],
+) -> None:
+    headers = progress_headers(section_spans)
+    ws = create_table_sheet(
+        wb, "Progress Summary", PROGRESS_COLUMN_WIDTHS, headers, PROGRESS_HEADER_FILL
+    )
 
-    headers = [
-        "Team Member",
-        *[section["title"] for section in template["sections"]],
-        "Overall %",
-        "Last Updated",
-    ]
-    ws.append(headers)
-    for cell in ws["1:1"]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="334155", end_color="334155", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = BORDER_THIN
+    row_count = 1
+    for row in iter_progress_rows(dataset, flat_items, section_spans):
+        ws.append(
+            [
+                styled_cell(
+                    ws,
+                    value,
+                    alignment=ALIGN_LEFT_VCENTER if col_idx == 1 else ALIGN_CENTER,
+                    border=BORDER_THIN,
+                )
+                for col_idx, value in enumerate(row, start=1)
+            ]
+        )
+        row_count += 1
 
-    updated = dataset.get("updated", "")
-    for person in dataset.get("people", []):
-        row = [person.get("name", "")]
-        total_completed = 0
-        total_items = 0
-        for section in template["sections"]:
-            items = section["items"]
-            completed = 0
-            for item in items:
-                competency = person.get("competencies", {}).get(item["id"], {})
-                if competency.get("status") == "Complete":
-                    completed += 1
-            total_items += len(items)
-            total_completed += completed
-            row.append(f"{completed} / {len(items)}")
+    if row_count >= 2:
+        percent_col_letter = get_column_letter(len(headers) - 1)
+        percent_range = ConditionalFormatting(
+            f"{percent_col_letter}2:{percent_col_letter}{row_count}"
+        )
+        for operator, _, formula, colour in PROGRESS_RULES:
+            ws.conditional_formatting.add(
+                percent_range,
+                CellIsRule(operator=operator, formula=list(formula), fill=make_fill(colour)),
+            )
 
-        overall_percent = round((total_completed / total_items) * 100) if total_items else 0
-        row.append(f"{overall_percent}%")
-        row.append(updated)
-        ws.append(row)
 
-    for row in ws.iter_rows(min_row=2, max_col=len(headers)):
-        for cell in row:
-            cell.border = BORDER_THIN
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            if cell.column == 1:
-                cell.alignment = Alignment(horizontal="left", vertical="center")
+def xlsxwriter_alignment(alignment: Alignment) -> dict:
+    """Translate one of the shared Alignment constants into xlsxwriter format properties."""
 
-    ws.freeze_panes = "A2"
+    properties = {}
+    if alignment.horizontal:
+        properties["align"] = alignment.horizontal
+    if alignment.vertical:
+        properties["valign"] = "vcenter" if alignment.vertical == "center" else alignment.vertical
+    if alignment.wrap_text:
+        properties["text_wrap"] = True
+    return properties
 
-    if ws.max_row >= 2:
-        percent_col_letter = get_column_letter(len(headers) - 1)
-        percent_range = f"{percent_col_letter}2:{percent_col_letter}{ws.max_row}"
-        ws.conditional_formatting.add(
-            percent_range,
-            CellIsRule(
-                operator="greaterThanOrEqual",
-                formula=["90"],
-                fill=PatternFill(
-                    start_color="D4EDDA", end_color="D4EDDA", fill_type="solid"
-                ),
-            ),
-        )
-        ws.conditional_formatting.add(
-            percent_range,
-            CellIsRule(
-                operator="between",
-                formula=["60", "89"],
-                fill=PatternFill(
-                    start_color="FFF3CD", end_color="FFF3CD", fill_type="solid"
-                ),
-            ),
+
+def build_workbook_xlsxwriter(output_path: Path, dataset: dict, template: dict) -> None:
+    """Write the workbook with xlsxwriter, streaming rows in constant-memory mode."""
+
+    try:
+        import xlsxwriter
+    except ModuleNotFoundError as exc:  # pragma: no cover - optional backend
+        raise SystemExit(
+            "xlsxwriter is required for --engine xlsxwriter. Install with `pip install xlsxwriter`."
+        ) from exc
+
+    section_styles = compute_section_styles(template)
+    status_options = template.get("statusOptions") or list(STATUS_COLOUR_PRESETS.keys())
+    default_status = dataset.get("defaults", {}).get(
+        "defaultStatus", status_options[0] if status_options else ""
+    )
+    flat_items, section_spans = flatten_template(template, section_styles, default_status)
+
+    # openpyxl writes URL-like notes as plain text; match it rather than auto-linking.
+    workbook = xlsxwriter.Workbook(
+        str(output_path), {"constant_memory": True, "strings_to_urls": False}
+    )
+    border = {"border": 1, "border_color": f"#{BORDER_COLOUR}"}
+
+    # xlsxwriter emits one <xf> record per Format object, so hand back the same
+    # Format for identical property sets instead of registering duplicates.
+    formats: Dict[Tuple[Tuple[str, object], ...], object] = {}
+
+    def add_format(alignment: Alignment | None = None, **properties):
+        if alignment is not None:
+            properties.update(xlsxwriter_alignment(alignment))
+        key = tuple(sorted(properties.items()))
+        cell_format = formats.get(key)
+        if cell_format is None:
+            cell_format = formats[key] = workbook.add_format(properties)
+        return cell_format
+
+    def header_format(fill_colour: str):
+        return add_format(
+            ALIGN_CENTER,
+            bold=True,
+            font_color=f"#{HEADER_TEXT_COLOUR}",
+            bg_color=f"#{fill_colour}",
+            **border,
         )
-        ws.conditional_formatting.add(
-            percent_range,
-            CellIsRule(
-                operator="lessThan",
-                formula=["60"],
-                fill=PatternFill(
-                    start_color="F8D7DA", end_color="F8D7DA", fill_type="solid"
-                ),
-            ),
+
+    # Overview
+    ws = workbook.add_worksheet("Overview")
+    ws.hide_gridlines(2)
+    for col, width in OVERVIEW_COLUMN_WIDTHS:
+        ws.set_column(f"{col}:{col}", width)
+    title_range, version_range = OVERVIEW_MERGED_RANGES
+    ws.merge_range(
+        title_range,
+        template["title"],
+        add_format(ALIGN_CENTER_H, font_size=20, bold=True, font_color=f"#{TEXT_COLOUR}"),
+    )
+    ws.merge_range(
+        version_range,
+        f"Version {template['version']} | Dataset updated {dataset['updated']}",
+        add_format(ALIGN_CENTER_H, font_size=11, font_color=f"#{SUBTITLE_COLOUR}"),
+    )
+    # Follow the openpyxl builder's row stream: a blank row separates each block, so
+    # the legend moves down with the number of instructions.
+    heading_format = add_format(font_size=14, bold=True, font_color=f"#{TEXT_COLOUR}")
+    row = 3
+    ws.write(row, 0, "How to use this workbook", heading_format)
+    instruction_format = add_format(ALIGN_LEFT, font_size=11)
+    for item in OVERVIEW_INSTRUCTIONS:
+        row += 1
+        ws.write(row, 0, f"• {item}", instruction_format)
+    row += 2
+    ws.write(row, 0, "Colour legend", heading_format)
+    row += 1
+    ws.write_row(
+        row,
+        0,
+        LEGEND_HEADERS,
+        add_format(
+            ALIGN_CENTER,
+            bold=True,
+            font_color=f"#{TEXT_COLOUR}",
+            bg_color=f"#{LEGEND_HEADER_FILL}",
+            **border,
+        ),
+    )
+    label_format = add_format(bold=True, font_color=f"#{TEXT_COLOUR}", **border)
+    description_format = add_format(ALIGN_WRAP, **border)
+    for row, section in enumerate(template["sections"], start=row + 1):
+        fill_colour, _ = section_styles.get(section["title"], DEFAULT_SECTION_STYLE)
+        ws.write(row, 0, section["title"], label_format)
+        ws.write(row, 1, section.get("description", ""), description_format)
+        ws.write_blank(row, 2, None, add_format(bg_color=f"#{fill_colour}", **border))
+
+    # Competency Matrix
+    ws = workbook.add_worksheet("Competency Matrix")
+    ws.hide_gridlines(2)
+    for col, width in MATRIX_COLUMN_WIDTHS:
+        ws.set_column(f"{col}:{col}", width)
+    ws.freeze_panes(1, 0)
+    ws.write_row(0, 0, MATRIX_HEADERS, header_format(MATRIX_HEADER_FILL))
+
+    def area_format(fill_colour: str, text_colour: str):
+        return add_format(
+            MATRIX_COLUMN_ALIGNMENTS[MATRIX_SECTION_COLUMN - 1],
+            bold=True,
+            font_color=f"#{text_colour}",
+            bg_color=f"#{fill_colour}",
+            **border,
         )
 
-    column_widths = {
-        "A": 24,
-        "B": 24,
-        "C": 24,
-        "D": 26,
-        "E": 16,
+    column_formats = [
+        add_format(alignment, **border) for alignment in MATRIX_COLUMN_ALIGNMENTS
+    ]
+    area_formats = {
+        title: area_format(fill_colour, text_colour)
+        for title, (fill_colour, text_colour) in section_styles.items()
     }
-    for col, width in column_widths.items():
-        ws.column_dimensions[col].width = width
-
+    fallback_area_format = area_format(*DEFAULT_SECTION_STYLE)
+    section_index = MATRIX_SECTION_COLUMN - 1
+    row = 0
+    for item, values in iter_matrix_rows(dataset, flat_items):
+        row += 1
+        column_formats[section_index] = area_formats.get(
+            item.section_title, fallback_area_format
+        )
+        for col, (value, cell_format) in enumerate(zip(values, column_formats)):
+            ws.write(row, col, value, cell_format)
+    if row:
+        status_col = MATRIX_STATUS_COLUMN - 1
+        ws.data_validation(
+            1, status_col, row, status_col, {"validate": "list", "source": status_options}
+        )
+        for status, colour in compute_status_colours(status_options).items():
+            ws.conditional_format(
+                1,
+                status_col,
+                row,
+                status_col,
+                {
+                    "type": "cell",
+                    "criteria": "equal to",
+                    "value": f'"{status}"',
+                    "format": add_format(bg_color=f"#{colour}"),
+                },
+            )
 
+    # Progress Summary
+    ws = workbook.add_worksheet("Progress Summary")
+    ws.hide_gridlines(2)
+    for col, width in PROGRESS_COLUMN_WIDTHS:
+        ws.set_column(f"{col}:{col}", width)
+    ws.freeze_panes(1, 0)
+    headers = progress_headers(section_spans)
+    ws.write_row(0, 0, headers, header_format(PROGRESS_HEADER_FILL))
+    name_format = add_format(ALIGN_LEFT_VCENTER, **border)
+    value_format = add_format(ALIGN_CENTER, **border)
+    row = 0
+    for values in iter_progress_rows(dataset, flat_items, section_spans):
+        row += 1
+        ws.write(row, 0, values[0], name_format)
+        ws.write_row(row, 1, values[1:], value_format)
+    if row:
+        percent_col = len(headers) - 2
+        for _, criteria, formula, colour in PROGRESS_RULES:
+            options = {
+                "type": "cell",
+                "criteria": criteria,
+                "format": add_format(bg_color=f"#{colour}"),
+            }
+            if len(formula) == 2:
+                options["minimum"], options["maximum"] = (int(value) for value in formula)
+            else:
+                options["value"] = int(formula[0])
+            ws.conditional_format(1, percent_col, row, percent_col, options)
+
+    workbook.close()
+
+
+# Most rows repeat a person's meta notes with no item notes, so results are shared.
+@lru_cache(maxsize=4096)
 def build_notes(meta_notes: str, item_notes: str) -> str:
-    notes = []
-    if meta_notes:
-        notes.append(meta_notes)
-    if item_notes:
-        notes.append(item_notes)
-    return "\n\n".join(notes)
+    if not item_notes:
+        return meta_notes or ""
+    if not meta_notes:
+        return item_notes
+    return f"{meta_notes}\n\n{item_notes}"
 
 
 def parse_args() -> argparse.Namespace:
@@ -400,6 +856,12 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_OUTPUT_PATH,
         help="Destination for the generated Excel workbook.",
     )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="openpyxl",
+        help="Library used to write the workbook (xlsxwriter streams large rosters faster).",
+    )
     return parser.parse_args()
 
 
@@ -407,11 +869,12 @@ def load_bundle(path: Path) -> dict:
     if not path.exists():
         raise FileNotFoundError(f"Unable to locate competency bundle at {path}")
 
-    with path.open("r", encoding="utf-8") as handle:
-        try:
-            payload = json.load(handle)
-        except json.JSONDecodeError as exc:
-            raise ValueError(f"{path} is not valid JSON: {exc}") from exc
+    data = path.read_bytes()
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        payload = orjson.loads(data) if orjson is not None else json.loads(data)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"{path} is not valid JSON: {exc}") from exc
 
     missing_keys = {"dataset", "template"} - payload.keys()
     if missing_keys:
@@ -436,11 +899,12 @@ def main() -> None:
     dataset = payload["dataset"]
     template = payload["template"]
 
-    workbook = build_workbook(dataset, template)
-
     output_path: Path = args.output
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    workbook.save(output_path)
+    if args.engine == "xlsxwriter":
+        build_workbook_xlsxwriter(output_path, dataset, template)
+    else:
+        build_workbook(dataset, template).save(output_path)
     print(f"Workbook written to {output_path}")
 
 